@@ -38,8 +38,11 @@ export class FPSCounter {
       // Not enough data yet
       return 0;
     }
-    const slice = this.samples.slice(0, this.index);
-    const avgDelta = slice.reduce((a, b) => a + b, 0) / slice.length;
-    return 1000 / avgDelta;
+    const count = Math.min(this.index, this.samples.length);
+    let sum = 0;
+    for (let i = 0; i < count; i++) {
+      sum += this.samples[i];
+    }
+    return 1000 / (sum / count);
   }
 }
@@ -2,6 +2,7 @@ import * as monaco from 'monaco-editor';
 import { FPSCounter } from './FPSCounter';
 import { examples } from './examples';
 import { exportProject } from './exportProject';
+import { palette } from './palette';
 import { HDLModuleWASM } from './sim/hdlwasm';
 import { compileVerilator } from './verilator/compile';
 
@@ -32,27 +33,23 @@ let jmod = new HDLModuleWASM(res.output.modules['TOP'], res.output.modules['@CON
 //let jmod = new HDLModuleJS(res.output.modules['TOP'], res.output.modules['@CONST-POOL@']);
 await jmod.init();
 
-function reset() {
-  const ui_in = jmod.state.ui_in;
-  jmod.powercycle();
-  jmod.state.ena = 1;
-  jmod.state.rst_n = 0;
-  jmod.state.ui_in = ui_in;
-  jmod.tick2(10);
-  jmod.state.rst_n = 1;
+// Direct view of the uo_out byte in the simulator memory (the presets all have one)
+let uoOut = jmod.getByteView('uo_out')!;
+
+function reset(mod = jmod) {
+  const ui_in = mod.state.ui_in;
+  mod.powercycle();
+  mod.state.ena = 1;
+  mod.state.rst_n = 0;
+  mod.state.ui_in = ui_in;
+  mod.tick2(10);
+  mod.state.rst_n = 1;
 }
 reset();
 
-function getVGASignals() {
-  const uo_out = jmod.state.uo_out as number;
-  return {
-    hsync: !!(uo_out & 0b10000000),
-    vsync: !!(uo_out & 0b00001000),
-    r: ((uo_out & 0b00000001) << 1) | ((uo_out & 0b00010000) >> 4),
-    g: ((uo_out & 0b00000010) << 0) | ((uo_out & 0b00100000) >> 5),
-    b: ((uo_out & 0b00000100) >> 1) | ((uo_out & 0b01000000) >> 6),
-  };
-}
+const HSYNC = 0b10000000;
+const VSYNC = 0b00001000;
+const SYNC = HSYNC | VSYNC;
 
 let stopped = false;
 const fpsCounter = new FPSCounter();
@@ -67,6 +64,31 @@ editor.onDidChangeModelContent(async () => {
     topModule: currentProject.topModule,
     sources: currentProject.sources,
   });
+  let newModule: HDLModuleWASM | null = null;
+  let newUoOut: Uint8Array | null = null;
+  if (res.output) {
+    // The simulator rejects some designs that Verilator accepts, report those like compile errors
+    try {
+      newModule = new HDLModuleWASM(res.output.modules['TOP'], res.output.modules['@CONST-POOL@']);
+      await newModule.init();
+      newUoOut = newModule.getByteView('uo_out');
+      if (!newUoOut) {
+        throw new Error(`${currentProject.topModule} must have an 8-bit uo_out output`);
+      }
+      reset(newModule);
+    } catch (e) {
+      console.log(e);
+      res.errors.push({
+        type: 'error',
+        file: '',
+        line: 1,
+        column: 1,
+        message: 'Simulation setup failed: ' + (e as Error).message,
+      });
+      newModule?.dispose();
+      newModule = null;
+    }
+  }
   monaco.editor.setModelMarkers(
     editor.getModel()!,
     'error',
@@ -79,16 +101,13 @@ editor.onDidChangeModelContent(async () => {
       severity: e.type === 'error' ? monaco.MarkerSeverity.Error : monaco.MarkerSeverity.Warning,
     }))
   );
-  if (!res.output) {
+  if (!newModule || !newUoOut) {
     return;
   }
-  if (jmod) {
-    jmod.dispose();
-  }
-  inputButtons.map((b) => b.classList.remove('active'));
-  jmod = new HDLModuleWASM(res.output.modules['TOP'], res.output.modules['@CONST-POOL@']);
-  await jmod.init();
-  reset();
+  jmod.dispose();
+  inputButtons.forEach((b) => b.classList.remove('active'));
+  jmod = newModule;
+  uoOut = newUoOut;
   fpsCounter.reset();
   stopped = false;
 });
@@ -96,14 +115,13 @@ editor.onDidChangeModelContent(async () => {
 const canvas = document.querySelector<HTMLCanvasElement>('#vga-canvas');
 const ctx = canvas?.getContext('2d');
 const imageData = ctx?.createImageData(736, 520);
+const pixels = imageData && new Uint32Array(imageData.data.buffer);
 const fpsDisplay = document.querySelector('#fps-count');
 
-function waitFor(condition: () => boolean, timeout = 10000) {
-  let counter = 0;
-  while (!condition() && counter < timeout) {
-    jmod.tick2(1);
-    counter++;
-  }
+function waitFor(signal: number, level: boolean, timeout = 10000) {
+  const expected = level ? signal : 0;
+  jmod.tick2Until(uoOut, signal, expected, timeout);
+  return (uoOut[0] & signal) === expected;
 }
 
 function animationFrame(now: number) {
@@ -115,33 +133,37 @@ function animationFrame(now: number) {
     fpsDisplay.textContent = `${fpsCounter.getFPS().toFixed(0)}`;
   }
 
-  if (stopped || !imageData || !ctx) {
+  if (stopped || !imageData || !pixels || !ctx) {
     return;
   }
 
-  const data = new Uint8Array(imageData.data.buffer);
+  // Set once an hsync wait times out: the design isn't generating hsync, so keep drawing
+  // 736-cycle lines without waiting for it on every one of them
+  let noHsync = false;
   frameLoop: for (let y = 0; y < 520; y++) {
-    waitFor(() => !getVGASignals().hsync);
-    for (let x = 0; x < 736; x++) {
-      const offset = (y * 736 + x) * 4;
+    if (!noHsync && !waitFor(HSYNC, false)) {
+      noHsync = true;
+    }
+    const lineEnd = (y + 1) * 736;
+    for (let offset = y * 736; offset < lineEnd; offset++) {
       jmod.tick2(1);
-      const { hsync, vsync, r, g, b } = getVGASignals();
-      if (hsync) {
-        break;
-      }
-      if (vsync) {
+      const uo_out = uoOut[0];
+      if (uo_out & SYNC) {
+        // Only sort out which sync it was on the rare cycles one is active
+        if (uo_out & HSYNC) {
+          break;
+        }
         break frameLoop;
       }
-      data[offset] = r << 6;
-      data[offset + 1] = g << 6;
-      data[offset + 2] = b << 6;
-      data[offset + 3] = 0xff;
+      pixels[offset] = palette[uo_out];
+    }
+    if (!noHsync && !waitFor(HSYNC, true)) {
+      noHsync = true;
     }
-    waitFor(() => getVGASignals().hsync);
   }
   ctx!.putImageData(imageData, 0, 0);
-  waitFor(() => getVGASignals().vsync);
-  waitFor(() => !getVGASignals().vsync);
+  waitFor(VSYNC, true);
+  waitFor(VSYNC, false);
 }
 
 requestAnimationFrame(animationFrame);
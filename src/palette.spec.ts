@@ -0,0 +1,25 @@
+import { describe, expect, test } from 'vitest';
+import { buildPalette } from './palette';
+
+function rgba(palette: Uint32Array, index: number) {
+  return Array.from(new Uint8Array(palette.buffer, index * 4, 4));
+}
+
+describe('buildPalette', () => {
+  test('Maps the Tiny VGA Pmod color bits', () => {
+    const palette = buildPalette();
+    expect(palette.length).toBe(256);
+    expect(rgba(palette, 0)).toEqual([0, 0, 0, 255]);
+    // R1 + G0
+    expect(rgba(palette, 0b00100001)).toEqual([128, 64, 0, 255]);
+    // B1 + B0
+    expect(rgba(palette, 0b01000100)).toEqual([0, 0, 192, 255]);
+  });
+
+  test('Ignores the sync bits', () => {
+    const palette = buildPalette();
+    for (let i = 0; i < 256; i++) {
+      expect(palette[i]).toBe(palette[i & 0b01110111]);
+    }
+  });
+});
@@ -0,0 +1,24 @@
+/**
+ * Builds an RGBA lookup table indexed by the raw uo_out value, following the
+ * Tiny VGA Pmod pinout: uo[0..2] = R1, G1, B1 (MSBs), uo[4..6] = R0, G0, B0 (LSBs).
+ *
+ * Each entry holds a whole ImageData pixel, so it can be stored with a single
+ * write through a Uint32Array view of the canvas buffer.
+ */
+export function buildPalette() {
+  const palette = new Uint32Array(256);
+  // Fill through a byte view so the entries match the platform's byte order
+  const bytes = new Uint8Array(palette.buffer);
+  for (let i = 0; i < 256; i++) {
+    const r = ((i & 0b00000001) << 1) | ((i & 0b00010000) >> 4);
+    const g = ((i & 0b00000010) << 0) | ((i & 0b00100000) >> 5);
+    const b = ((i & 0b00000100) >> 1) | ((i & 0b01000000) >> 6);
+    bytes[i * 4] = r << 6;
+    bytes[i * 4 + 1] = g << 6;
+    bytes[i * 4 + 2] = b << 6;
+    bytes[i * 4 + 3] = 0xff;
+  }
+  return palette;
+}
+
+export const palette = buildPalette();
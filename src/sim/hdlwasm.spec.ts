@@ -0,0 +1,110 @@
+import { describe, expect, test } from 'vitest';
+import { HDLModuleWASM } from './hdlwasm';
+import { HDLBlock, HDLExpr, HDLLogicType, HDLModuleDef, HDLVariableDef } from './hdltypes';
+
+const bit: HDLLogicType = { left: 0, right: 0, signed: false };
+const byte: HDLLogicType = { left: 7, right: 0, signed: false };
+
+function vardef(name: string, dtype: HDLLogicType, isInput: boolean, isOutput: boolean) {
+  const def: HDLVariableDef = { name, origName: name, dtype, isInput, isOutput, isParam: false };
+  return def;
+}
+
+function ref(name: string, dtype: HDLLogicType): HDLExpr {
+  return { refname: name, dtype };
+}
+
+function cfunc(name: string, exprs: HDLExpr[]): HDLBlock {
+  return { blocktype: 'cfunc', name, exprs };
+}
+
+// uo_out counts up once per rising clock edge, or once per eval() without a clock
+function counterModule(clocked: boolean): HDLModuleDef {
+  const increment: HDLExpr = {
+    op: 'assign',
+    left: {
+      op: 'add',
+      left: ref('uo_out', byte),
+      right: { cvalue: 1, bigvalue: null, dtype: byte },
+      dtype: byte,
+    },
+    right: ref('uo_out', byte),
+    dtype: byte,
+  };
+  const evalExprs: HDLExpr[] = clocked
+    ? [
+        {
+          op: 'if',
+          cond: { op: 'gt', left: ref('clk', bit), right: ref('clk_last', bit), dtype: bit },
+          left: increment,
+          right: null,
+          dtype: byte,
+        },
+        { op: 'assign', left: ref('clk', bit), right: ref('clk_last', bit), dtype: bit },
+      ]
+    : [increment];
+  const vardefs: Record<string, HDLVariableDef> = { uo_out: vardef('uo_out', byte, false, true) };
+  if (clocked) {
+    vardefs.clk = vardef('clk', bit, true, false);
+    vardefs.clk_last = vardef('clk_last', bit, false, false);
+  }
+  return {
+    name: 'TOP',
+    origName: 'TOP',
+    instances: [],
+    vardefs,
+    blocks: [
+      cfunc('_ctor_var_reset', []),
+      cfunc('_eval_initial', []),
+      cfunc('_eval_settle', []),
+      cfunc('_eval', evalExprs),
+      cfunc('_change_request', []),
+    ],
+  };
+}
+
+async function createModule(clocked: boolean) {
+  const mod = new HDLModuleWASM(counterModule(clocked), null);
+  await mod.init();
+  mod.powercycle();
+  return mod;
+}
+
+describe('HDLModuleWASM.tick2Until', () => {
+  test('Runs clock cycles until the masked value matches', async () => {
+    const mod = await createModule(true);
+    const uo_out = mod.getByteView('uo_out')!;
+    expect(uo_out[0]).toBe(0);
+
+    expect(mod.tick2Until(uo_out, 0xff, 5, 100)).toBe(5);
+    expect(uo_out[0]).toBe(5);
+
+    // only the masked bits are compared
+    expect(mod.tick2Until(uo_out, 0b11, 0b00, 100)).toBe(3);
+    expect(uo_out[0]).toBe(8);
+
+    // already matching: no cycles are run
+    expect(mod.tick2Until(uo_out, 0xff, 8, 100)).toBe(0);
+    expect(uo_out[0]).toBe(8);
+    mod.dispose();
+  });
+
+  test('Runs eval() steps when the design has no clock', async () => {
+    const mod = await createModule(false);
+    const uo_out = mod.getByteView('uo_out')!;
+    const start = uo_out[0];
+
+    expect(mod.tick2Until(uo_out, 0xff, start + 3, 100)).toBe(3);
+    expect(uo_out[0]).toBe(start + 3);
+    mod.dispose();
+  });
+
+  test('Stops after the given number of cycles', async () => {
+    const mod = await createModule(true);
+    const uo_out = mod.getByteView('uo_out')!;
+
+    expect(mod.tick2Until(uo_out, 0xff, 200, 10)).toBe(10);
+    expect(uo_out[0]).toBe(10);
+    mod.dispose();
+  });
+});
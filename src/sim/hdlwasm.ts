@@ -225,6 +225,17 @@ export class HDLModuleWASM implements HDLModuleRunner {
   traceEndOffset: number;
   trace: any;
 
+  // hot exported functions, looked up once per instance
+  private evalFn: (dseg: number) => number;
+  private tick2Fn: (dseg: number, iters: number) => void;
+  private tick2UntilFn: (
+    dseg: number,
+    iters: number,
+    addr: number,
+    mask: number,
+    value: number
+  ) => number;
+
   randomizeOnReset: boolean = false;
   finished: boolean;
   stopped: boolean;
@@ -272,7 +283,7 @@ export class HDLModuleWASM implements HDLModuleRunner {
   }
 
   eval() {
-    (this.instance.exports as any).eval(GLOBALOFS);
+    this.evalFn(GLOBALOFS);
   }
 
   tick() {
@@ -281,7 +292,20 @@ export class HDLModuleWASM implements HDLModuleRunner {
   }
 
   tick2(iters: number) {
-    (this.instance.exports as any).tick2(GLOBALOFS, iters);
+    this.tick2Fn(GLOBALOFS, iters);
+  }
+
+  // run up to `iters` clock cycles, stopping as soon as (view[0] & mask) == value
+  // `view` comes from getByteView(); returns the number of cycles that were run
+  tick2Until(view: Uint8Array, mask: number, value: number, iters: number) {
+    return iters - this.tick2UntilFn(GLOBALOFS, iters, view.byteOffset, mask, value);
+  }
+
+  // direct view of an 8-bit variable, bypassing the state proxy (null if there is none)
+  getByteView(varname: string): Uint8Array | null {
+    var vref = this.globals.lookup(varname);
+    if (vref == null || vref.size != 1) return null;
+    return new Uint8Array(this.databuf, GLOBALOFS + vref.offset, 1);
   }
 
   isFinished() {
@@ -349,6 +373,9 @@ export class HDLModuleWASM implements HDLModuleRunner {
       this.bmod.dispose();
       this.bmod = null;
       this.instance = null;
+      this.evalFn = null;
+      this.tick2Fn = null;
+      this.tick2UntilFn = null;
       this.databuf = null;
       this.data8 = null;
       this.data16 = null;
@@ -504,6 +531,9 @@ export class HDLModuleWASM implements HDLModuleRunner {
 
   private genStateInterface() {
     this.databuf = (this.instance.exports[MEMORY] as any).buffer;
+    this.evalFn = (this.instance.exports as any).eval;
+    this.tick2Fn = (this.instance.exports as any).tick2;
+    this.tick2UntilFn = (this.instance.exports as any).tick2Until;
     this.data8 = new Uint8Array(this.databuf);
     this.data16 = new Uint16Array(this.databuf);
     this.data32 = new Uint32Array(this.databuf);
@@ -624,6 +654,7 @@ export class HDLModuleWASM implements HDLModuleRunner {
     this.addCopyTraceRecFunction();
     this.addEvalFunction();
     this.addTick2Function();
+    this.addTick2UntilFunction();
   }
 
   private addImportedFunctions() {
@@ -804,6 +835,62 @@ export class HDLModuleWASM implements HDLModuleRunner {
     }
   }
 
+  private addTick2UntilFunction() {
+    const m = this.bmod;
+    var i32 = binaryen.i32;
+    var l_block = this.label('@block');
+    var l_loop = this.label('@loop');
+    var v_dseg = m.local.get(0, i32);
+    // one iteration: a full clock cycle, or just eval() like tick2 when there's no clock
+    var step = this.globals.lookup('clk')
+      ? [
+          this.makeSetVariableFunction('clk', 0),
+          m.drop(m.call('eval', [v_dseg], i32)),
+          this.makeSetVariableFunction('clk', 1),
+          m.drop(m.call('eval', [v_dseg], i32)),
+          // call copyTraceRec
+          m.call('copyTraceRec', [], binaryen.none),
+        ]
+      : [m.drop(m.call('eval', [v_dseg], i32))];
+    // params: data seg, max iterations, address of 8-bit variable, mask, value
+    m.addFunction(
+      'tick2Until',
+      binaryen.createType([i32, i32, i32, i32, i32]),
+      i32,
+      [],
+      m.block(
+        null,
+        [
+          m.block(l_block, [
+            m.loop(
+              l_loop,
+              m.block(null, [
+                // break if ([$2] & $3) == $4
+                m.br_if(
+                  l_block,
+                  m.i32.eq(
+                    m.i32.and(m.i32.load8_u(0, 1, m.local.get(2, i32)), m.local.get(3, i32)),
+                    m.local.get(4, i32)
+                  )
+                ),
+                // break if $1 == 0
+                m.br_if(l_block, m.i32.eqz(m.local.get(1, i32))),
+                ...step,
+                // $1 = $1 - 1, goto @loop
+                m.local.set(1, m.i32.sub(m.local.get(1, i32), m.i32.const(1))),
+                m.br(l_loop),
+              ])
+            ),
+          ]),
+          // return remaining iterations
+          m.local.get(1, i32),
+        ],
+        i32
+      )
+    );
+    m.addFunctionExport('tick2Until', 'tick2Until');
+  }
+
   private addEvalFunction() {
     this.bmod.addFunction(
       'eval',
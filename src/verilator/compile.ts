@@ -3,7 +3,11 @@ import { ErrorParser, IErrorMessage } from './ErrorParser';
 import verilator_bin from './verilator_bin';
 import verilator_wasm from './verilator_bin.wasm?url';
 
-const verilator_wasm_bin = await fetch(verilator_wasm).then((res) => res.arrayBuffer());
+// Compiled once, then instantiated for every compilation. Loading starts right away but isn't
+// awaited here, so the rest of the page can initialize while the binary downloads.
+const verilator_wasm_module = fetch(verilator_wasm)
+  .then((res) => res.arrayBuffer())
+  .then((bin) => WebAssembly.compile(bin));
 
 export interface ICompileOptions {
   topModule: string;
@@ -12,9 +16,23 @@ export interface ICompileOptions {
 
 export async function compileVerilator(opts: ICompileOptions) {
   const errorParser = new ErrorParser();
+  const wasmModule = await verilator_wasm_module;
+  // instantiateWasm can't report failures to emscripten, so surface them here instead
+  let rejectInstantiate: (reason: unknown) => void;
+  const instantiateFailed = new Promise<never>((_, reject) => {
+    rejectInstantiate = reject;
+  });
 
   const verilatorInst = verilator_bin({
-    wasmBinary: verilator_wasm_bin,
+    instantiateWasm: (
+      imports: WebAssembly.Imports,
+      receiveInstance: (instance: WebAssembly.Instance, module: WebAssembly.Module) => void
+    ) => {
+      WebAssembly.instantiate(wasmModule, imports)
+        .then((instance) => receiveInstance(instance, wasmModule))
+        .catch(rejectInstantiate);
+      return {};
+    },
     noInitialRun: true,
     noExitRuntime: true,
     print: console.log,
@@ -23,7 +41,7 @@ export async function compileVerilator(opts: ICompileOptions) {
       errorParser.feedLine(message);
     },
   });
-  await verilatorInst.ready;
+  await Promise.race([verilatorInst.ready, instantiateFailed]);
   const { FS } = verilatorInst;
 
   let sourceList: string[] = [];
@@ -61,7 +79,7 @@ export async function compileVerilator(opts: ICompileOptions) {
     });
   }
 
-  if (errorParser.errors.filter((e) => e.type === 'error').length) {
+  if (errorParser.errors.some((e) => e.type === 'error')) {
     return { errors: errorParser.errors };
   }
 